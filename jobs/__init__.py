@@ -1,8 +1,35 @@
 """Job modules for fetching event data."""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from jobs import my_events, nightlife, weekend
+from jobs.event_records import EventRecord, merge_event_records
 
 __all__ = [
     "go_out",
     "nightlife",
     "weekend",
     "my_events",
+    "run_all",
 ]
+
+
+def run_all(referral: Optional[str] = None) -> List[EventRecord]:
+    """Run all fetch jobs concurrently and return merged event records.
+
+    The jobs are independent and network-bound, so a small thread pool
+    makes the wall time the slowest job instead of the sum. They all share
+    the process-wide pooled session, so connections are reused across the
+    threads.
+    """
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(my_events.run_job),
+            executor.submit(nightlife.run_job, referral),
+            executor.submit(weekend.run_job, referral),
+        ]
+        collections = [future.result() for future in futures]
+    return merge_event_records(collections)
@@ -0,0 +1,39 @@
+"""File-backed TTL cache for fetched event URL lists."""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from jobs._io import atomic_write_bytes
+
+CACHE_DIR = Path("auth_payload") / "cache"
+
+
+def _path_for(key: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+def get(key: str) -> Optional[Any]:
+    """Return the cached value for *key*, or None when missing or expired."""
+
+    try:
+        content = json.loads(_path_for(key).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(content, dict):
+        return None
+    expires_at = content.get("expires_at")
+    if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+        return None
+    return content.get("value")
+
+
+def put(key: str, value: Any, ttl: float) -> None:
+    """Store *value* under *key* for *ttl* seconds."""
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps({"expires_at": time.time() + ttl, "value": value})
+    atomic_write_bytes(_path_for(key), payload.encode("utf-8"))
@@ -0,0 +1,24 @@
+"""Small filesystem helpers shared by the fetch jobs."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write *data* to *path* atomically via a temp-file rename.
+
+    The data lands in a sibling ``.tmp`` file first and is moved into place
+    with ``os.replace``, so readers never observe a partially-written file.
+    Writes are skipped entirely when the file already holds *data*, keeping
+    mtimes (and anything keyed on them) stable across no-change runs.
+    """
+
+    try:
+        if path.read_bytes() == data:
+            return
+    except OSError:
+        pass
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
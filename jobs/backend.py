@@ -4,20 +4,30 @@ from __future__ import annotations
 import json
 import logging
 import os
+import re
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Mapping, Optional, Sequence
-from urllib import parse as urllib_parse
 
 import requests
 
+from jobs import http
+from jobs._io import atomic_write_bytes
+
 LOGGER = logging.getLogger(__name__)
 
 DEFAULT_BASE_URL = "https://parties247-backend.onrender.com"
+DEFAULT_MAX_WORKERS = 10
 LOGIN_ENDPOINT = "/api/admin/login"
 IMPORT_ENDPOINT = "/api/admin/import/carousel-urls"
 ADD_PARTY_ENDPOINT = "/api/admin/add-party"
+ADD_PARTIES_BULK_ENDPOINT = "/api/admin/add-parties"
 PASSWORD_ENV_VAR = "PARTIES247_ADMIN_PASSWORD"
 DEFAULT_ENV_PATH = Path(__file__).resolve().parents[1] / ".env"
+TOKEN_CACHE_FILE = Path("auth_payload") / "backend_token.json"
+TOKEN_CACHE_TTL = 3300  # seconds; stays safely under the backend's token expiry
 
 
 class BackendError(RuntimeError):
@@ -28,21 +38,19 @@ class BackendAuthenticationError(BackendError):
     """Raised when backend authentication fails."""
 
 
+# Matches KEY=value lines in one multiline pass, skipping comments and
+# lines without an assignment.
+_ENV_LINE_RE = re.compile(
+    r"^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*([^\n]*?)[ \t]*$", re.MULTILINE
+)
+
+
 def _load_env(path: Path) -> Dict[str, str]:
     content = path.read_text(encoding="utf-8")
-    values: Dict[str, str] = {}
-    for line in content.splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
-        if "=" not in stripped:
-            continue
-        key, value = stripped.split("=", 1)
-        key = key.strip()
-        value = value.strip().strip('"').strip("'")
-        if key:
-            values[key] = value
-    return values
+    return {
+        key: value.strip('"').strip("'")
+        for key, value in _ENV_LINE_RE.findall(content)
+    }
 
 
 def get_admin_password(env_path: Optional[Path] = None) -> str:
@@ -67,8 +75,47 @@ def get_admin_password(env_path: Optional[Path] = None) -> str:
     return password
 
 
+def _load_cached_token() -> Optional[str]:
+    try:
+        with TOKEN_CACHE_FILE.open(encoding="utf-8") as file:
+            content = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(content, dict):
+        return None
+    token = content.get("token")
+    expires_at = content.get("exp")
+    if not token or not isinstance(expires_at, (int, float)):
+        return None
+    if expires_at <= time.time():
+        return None
+    return str(token)
+
+
+def _invalidate_cached_token() -> None:
+    try:
+        TOKEN_CACHE_FILE.unlink()
+    except OSError:
+        pass
+
+
+def _store_cached_token(token: str) -> None:
+    try:
+        TOKEN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"token": token, "exp": time.time() + TOKEN_CACHE_TTL})
+        atomic_write_bytes(TOKEN_CACHE_FILE, payload.encode("utf-8"))
+        TOKEN_CACHE_FILE.chmod(stat.S_IRUSR | stat.S_IWUSR)
+    except OSError:  # pragma: no cover - cache is best-effort
+        LOGGER.debug("Unable to persist backend token to %s", TOKEN_CACHE_FILE)
+
+
 class PartiesAdminClient:
-    """Minimal client for interacting with the Parties247 admin backend."""
+    """Minimal client for interacting with the Parties247 admin backend.
+
+    ``session`` accepts any object exposing the ``requests.Session`` ``post``
+    signature, so deployments wanting HTTP/2 multiplexing can inject e.g. an
+    ``httpx.Client(http2=True)`` without changes here.
+    """
 
     def __init__(
         self,
@@ -76,19 +123,25 @@ class PartiesAdminClient:
         base_url: str = DEFAULT_BASE_URL,
         session: Optional[requests.Session] = None,
         env_path: Optional[Path] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ) -> None:
         self._base_url = base_url.rstrip("/")
-        self._session = session or requests.Session()
+        # The endpoint set is tiny and fixed, so the joined URLs are computed
+        # once here instead of per request.
+        self._login_url = self._base_url + LOGIN_ENDPOINT
+        self._import_url = self._base_url + IMPORT_ENDPOINT
+        self._add_party_url = self._base_url + ADD_PARTY_ENDPOINT
+        self._add_parties_bulk_url = self._base_url + ADD_PARTIES_BULK_ENDPOINT
+        self._session = session or http.get_session()
         self._env_path = env_path
         self._token: Optional[str] = None
-
-    def _url(self, path: str) -> str:
-        return urllib_parse.urljoin(f"{self._base_url}/", path.lstrip("/"))
+        self._auth_headers: Optional[Dict[str, str]] = None
+        self._max_workers = max_workers
 
     def login(self) -> str:
         password = get_admin_password(env_path=self._env_path)
         response = self._session.post(
-            self._url(LOGIN_ENDPOINT),
+            self._login_url,
             json={"password": password},
             timeout=20,
         )
@@ -100,13 +153,19 @@ class PartiesAdminClient:
         if not token:
             raise BackendAuthenticationError("Backend authentication response missing token")
         self._token = str(token)
+        self._auth_headers = {"Authorization": f"Bearer {self._token}"}
+        _store_cached_token(self._token)
         LOGGER.debug("Authenticated with Parties247 backend")
         return self._token
 
     def _authorization_header(self) -> Mapping[str, str]:
+        if not self._token:
+            self._token = _load_cached_token()
         if not self._token:
             self.login()
-        return {"Authorization": f"Bearer {self._token}"}
+        if self._auth_headers is None:
+            self._auth_headers = {"Authorization": f"Bearer {self._token}"}
+        return self._auth_headers
 
     def import_carousel_urls(
         self,
@@ -118,14 +177,14 @@ class PartiesAdminClient:
         if not carousel_name:
             raise ValueError("carousel_name must be provided")
 
-        headers = dict(self._authorization_header())
+        headers = self._authorization_header()
         payload = {
             "carouselName": carousel_name,
             "referral": referral,
             "urls": list(urls),
         }
         response = self._session.post(
-            self._url(IMPORT_ENDPOINT),
+            self._import_url,
             json=payload,
             headers=headers,
             timeout=20,
@@ -133,9 +192,11 @@ class PartiesAdminClient:
         if response.status_code == 401:
             LOGGER.info("Backend token expired, attempting to re-authenticate")
             self._token = None
-            headers = dict(self._authorization_header())
+            self._auth_headers = None
+            _invalidate_cached_token()
+            headers = self._authorization_header()
             response = self._session.post(
-                self._url(IMPORT_ENDPOINT),
+                self._import_url,
                 json=payload,
                 headers=headers,
                 timeout=20,
@@ -152,10 +213,10 @@ class PartiesAdminClient:
         if not url:
             raise ValueError("url must be provided")
 
-        headers = dict(self._authorization_header())
+        headers = self._authorization_header()
         payload = {"url": url}
         response = self._session.post(
-            self._url(ADD_PARTY_ENDPOINT),
+            self._add_party_url,
             json=payload,
             headers=headers,
             timeout=20,
@@ -163,9 +224,11 @@ class PartiesAdminClient:
         if response.status_code == 401:
             LOGGER.info("Backend token expired while adding party, retrying")
             self._token = None
-            headers = dict(self._authorization_header())
+            self._auth_headers = None
+            _invalidate_cached_token()
+            headers = self._authorization_header()
             response = self._session.post(
-                self._url(ADD_PARTY_ENDPOINT),
+                self._add_party_url,
                 json=payload,
                 headers=headers,
                 timeout=20,
@@ -209,22 +272,101 @@ class PartiesAdminClient:
         payload.setdefault("detail", "Party added successfully")
         return payload
 
+    def add_party_urls_bulk(self, urls: Sequence[str]) -> List[Dict[str, object]]:
+        """Send all event URLs to the backend in one bulk request.
+
+        Falls back to the per-URL :meth:`add_party_urls` loop when the
+        backend does not expose the bulk endpoint.
+        """
+
+        urls = list(urls)
+        if not urls:
+            return []
+
+        headers = self._authorization_header()
+        payload = {"urls": urls}
+        response = self._session.post(
+            self._add_parties_bulk_url,
+            json=payload,
+            headers=headers,
+            timeout=20,
+        )
+        if response.status_code == 401:
+            LOGGER.info("Backend token expired during bulk add, retrying")
+            self._token = None
+            self._auth_headers = None
+            _invalidate_cached_token()
+            headers = self._authorization_header()
+            response = self._session.post(
+                self._add_parties_bulk_url,
+                json=payload,
+                headers=headers,
+                timeout=20,
+            )
+        if response.status_code in (404, 405):
+            LOGGER.info("Backend lacks bulk add endpoint, falling back to per-URL posts")
+            return self.add_party_urls(urls)
+        response.raise_for_status()
+        try:
+            data = response.json()
+        except json.JSONDecodeError as exc:  # pragma: no cover - unexpected backend issue
+            raise BackendError("Backend response was not valid JSON") from exc
+        results = data.get("results") if isinstance(data, Mapping) else None
+        if not isinstance(results, list):
+            raise BackendError("Bulk add response missing results list")
+        return [result if isinstance(result, dict) else {"data": result} for result in results]
+
+    def _add_party_url_guarded(self, url: str) -> Dict[str, object]:
+        """Run :meth:`add_party_url`, turning transport failures into error results.
+
+        One unreachable URL must not abort the rest of a concurrent batch.
+        """
+
+        try:
+            return self.add_party_url(url)
+        except requests.RequestException as exc:
+            LOGGER.error("Request failed for party URL '%s': %s", url, exc)
+            return {"detail": str(exc), "status_code": None}
+
     def add_party_urls(self, urls: Sequence[str]) -> List[Dict[str, object]]:
-        """Send multiple event URLs to the backend and log their statuses."""
+        """Send multiple event URLs to the backend concurrently and log their statuses."""
+
+        urls = list(urls)
+        if not urls:
+            return []
+
+        # Authenticate once up front so worker threads do not race on login.
+        self._authorization_header()
+        max_workers = min(self._max_workers, len(urls))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._add_party_url_guarded, urls))
 
-        results: List[Dict[str, object]] = []
-        status_lines: List[str] = []
-        for url in urls:
-            result = self.add_party_url(url)
-            results.append(result)
+        added = conflicts = errors = 0
+        log_statuses = LOGGER.isEnabledFor(logging.INFO)
+        for url, result in zip(urls, results):
             status_code = result.get("status_code")
-            detail = result.get("detail")
-            status_line = f"{url}: {status_code}"
-            if detail:
-                status_line += f" - {detail}"
-            status_lines.append(status_line)
-        if status_lines:
-            LOGGER.info("Party add statuses: %s", "; ".join(status_lines))
+            if status_code == 409:
+                conflicts += 1
+            elif status_code is None or (
+                isinstance(status_code, int) and status_code >= 400
+            ):
+                errors += 1
+            else:
+                added += 1
+            if log_statuses:
+                LOGGER.info(
+                    "Party add status: %s -> %s %s",
+                    url,
+                    status_code,
+                    result.get("detail"),
+                )
+        LOGGER.info(
+            "Sent %d party URLs: %d added, %d conflict, %d error",
+            len(urls),
+            added,
+            conflicts,
+            errors,
+        )
         return results
 
 
@@ -1,27 +1,29 @@
 """Shared helpers for representing fetched event URLs."""
 from __future__ import annotations
 
-from typing import Iterable, List, Sequence, TypedDict
+from itertools import chain
+from typing import Iterable, List, NamedTuple, Sequence
 
 
-class EventRecord(TypedDict):
-    """Structure describing a fetched event URL."""
+class EventRecord(NamedTuple):
+    """Immutable record describing a fetched event URL.
+
+    A ``NamedTuple`` rather than a dict: records are created in the
+    hundreds per run and only ever read, so the tuple layout saves the
+    per-record dict overhead on the merge path.
+    """
 
     title: str
     url: str
 
 
-def build_event_records(title: str, urls: Sequence[str]) -> List[EventRecord]:
+def build_event_records(title: str, urls: Iterable[str]) -> List[EventRecord]:
     """Return ``EventRecord`` objects for *urls* with the provided *title*."""
 
-    return [{"title": title, "url": url} for url in urls]
+    return [EventRecord(title, url) for url in urls]
 
 
 def merge_event_records(collections: Iterable[Sequence[EventRecord]]) -> List[EventRecord]:
     """Flatten an iterable of event record collections into a single list."""
 
-    merged: List[EventRecord] = []
-    for records in collections:
-        merged.extend(records)
-    return merged
-
+    return list(chain.from_iterable(collections))
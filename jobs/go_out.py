@@ -3,38 +3,79 @@ from __future__ import annotations
 
 import json
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Iterable, List, Mapping, MutableMapping, Optional
-from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+from urllib.parse import quote, urljoin, urlparse
 
 import requests
 
+from jobs import _cache, http
+
 LOGGER = logging.getLogger(__name__)
 
 GO_OUT_BASE_URL = "https://www.go-out.co"
 GO_OUT_API_BASE_URL = urljoin(GO_OUT_BASE_URL, "/endOne/")
 GO_OUT_EVENT_BASE_URL = urljoin(GO_OUT_BASE_URL, "/event/")
 DEFAULT_TIMEOUT = 15
+DEFAULT_CACHE_TTL = 600  # seconds; Go Out listings change on that order
 
 DISABLE_PROXIES = {"http": None, "https": None}
 
+# Compiled once at import so HTML scans do not pay a per-call re.compile.
+_EVENT_SLUG_RE = re.compile(r"/event/([a-zA-Z0-9-]+)")
+_EVENT_SLUG_RE_BYTES = re.compile(rb"/event/([a-zA-Z0-9-]+)")
+
+# Matches an existing aff parameter in a query string for in-place rewrite.
+_AFF_PARAM_RE = re.compile(r"(^|[?&])aff=[^&]*")
+
+# Keys tried, in order, when extracting an event slug from a ticket item.
+_SLUG_KEYS = ("Url", "url", "slug", "Slug", "_id", "id")
+
+
+@lru_cache(maxsize=2)
+def _iso_for(epoch_s: int) -> str:
+    return datetime.fromtimestamp(epoch_s, tz=timezone.utc).isoformat()
+
 
 def _format_iso_timestamp() -> str:
-    """Return an ISO 8601 timestamp in UTC including timezone information."""
-    return datetime.now(tz=timezone.utc).replace(microsecond=0).isoformat()
+    """Return an ISO 8601 timestamp in UTC including timezone information.
+
+    Memoized per second so rapid successive fetches reuse one string.
+    """
+    return _iso_for(int(time.time()))
+
 
+@lru_cache(maxsize=4)
+def _encode_referral(referral: str) -> str:
+    return quote(referral, safe="")
 
+
+@lru_cache(maxsize=4096)
 def append_affiliate_param(url: str, referral: Optional[str]) -> str:
-    """Append an affiliate parameter to *url* if *referral* is provided."""
+    """Append an affiliate parameter to *url* if *referral* is provided.
+
+    Memoized: polling jobs see the same URLs run after run, and the rewrite
+    is deterministic. Long-running schedulers can call
+    ``append_affiliate_param.cache_clear()`` to release the entries.
+    """
     if not referral:
         return url
-    parsed = urlparse(url)
-    query = list(parse_qsl(parsed.query, keep_blank_values=True))
-    query = [(k, v) for k, v in query if k != "aff"]
-    query.append(("aff", referral))
-    encoded = urlencode(query)
-    return urlunparse(parsed._replace(query=encoded))
+    encoded = _encode_referral(referral)
+    if "?" not in url:
+        # Fast path: freshly-built event URLs never carry a query string.
+        return f"{url}?aff={encoded}"
+    # Rewrite any existing aff value in place rather than round-tripping the
+    # whole query string through parse_qsl/urlencode.
+    rewritten, substituted = _AFF_PARAM_RE.subn(rf"\g<1>aff={encoded}", url, count=1)
+    if substituted:
+        return rewritten
+    separator = "" if url[-1] in "?&" else "&"
+    return f"{url}{separator}aff={encoded}"
 
 
 def _clean_slug(slug: str) -> Optional[str]:
@@ -49,7 +90,7 @@ def _clean_slug(slug: str) -> Optional[str]:
 def _extract_event_slug_from_ticket_item(item: Mapping[str, object]) -> Optional[str]:
     if not isinstance(item, Mapping):
         return None
-    for key in ("Url", "url", "slug", "Slug", "_id", "id"):
+    for key in _SLUG_KEYS:
         if key not in item:
             continue
         value = item.get(key)
@@ -69,31 +110,70 @@ def _extract_event_slug_from_ticket_item(item: Mapping[str, object]) -> Optional
     return None
 
 
-def _collect_go_out_event_urls(events: Iterable[Mapping[str, object]], referral: Optional[str]) -> List[str]:
-    urls: List[str] = []
+def _iter_go_out_event_urls(
+    events: Iterable[Mapping[str, object]], referral: Optional[str]
+) -> Iterator[str]:
+    """Yield deduplicated event URLs without materializing an intermediate list."""
+
+    base = GO_OUT_EVENT_BASE_URL
+    # Slug-built URLs never carry a query string, so the affiliate suffix can
+    # be encoded once for the whole batch and concatenated per URL.
+    suffix = "?aff=" + _encode_referral(referral) if referral else ""
     seen: set[str] = set()
     for event in events or []:
         slug = _extract_event_slug_from_ticket_item(event)
-        if not slug:
+        if not slug or slug in seen:
             continue
-        event_url = f"{GO_OUT_EVENT_BASE_URL}{slug}"
-        event_url = append_affiliate_param(event_url, referral)
-        if event_url in seen:
-            continue
-        seen.add(event_url)
-        urls.append(event_url)
-    return urls
+        seen.add(slug)
+        yield base + slug + suffix
+
+
+def _collect_go_out_event_urls(events: Iterable[Mapping[str, object]], referral: Optional[str]) -> List[str]:
+    return list(_iter_go_out_event_urls(events, referral))
 
 
 @dataclass
 class GoOutFetcher:
-    """A helper that fetches Go Out events with a graceful HTML fallback."""
+    """A helper that fetches Go Out events with a graceful HTML fallback.
+
+    ``session`` only needs the ``request``/``get`` surface of
+    ``requests.Session``, so an HTTP/2-capable client can be injected where
+    multiplexing to go-out.co matters.
+    """
 
     referral: Optional[str] = None
-    session: requests.Session = field(default_factory=requests.Session)
+    session: requests.Session = field(default_factory=http.get_session)
     timeout: int = DEFAULT_TIMEOUT
+    # Opt-in disk cache of collected URL lists, so closely-spaced runs skip
+    # the network round trip entirely.
+    use_cache: bool = False
+    cache_ttl: int = DEFAULT_CACHE_TTL
+
+    def __post_init__(self) -> None:
+        # The referral never changes over a fetcher's lifetime, so the
+        # affiliate suffix is encoded once here instead of per URL.
+        self._aff_suffix = "?aff=" + _encode_referral(self.referral) if self.referral else ""
+
+    def _with_cache(self, category: str, fetch) -> List[str]:
+        if not self.use_cache:
+            return fetch()
+        key = f"{category}|{self.referral or ''}"
+        cached = _cache.get(key)
+        if cached is not None:
+            LOGGER.info("Serving %s event URLs from cache", category)
+            return list(cached)
+        urls = fetch()
+        if urls:
+            _cache.put(key, urls, self.cache_ttl)
+        return urls
 
     def fetch_nightlife_events(self) -> List[str]:
+        return self._with_cache("nightlife", self._fetch_nightlife_events)
+
+    def fetch_weekend_events(self) -> List[str]:
+        return self._with_cache("weekend", self._fetch_weekend_events)
+
+    def _fetch_nightlife_events(self) -> List[str]:
         payload: MutableMapping[str, object] = {
             "skip": 0,
             "limit": 50,
@@ -109,7 +189,7 @@ class GoOutFetcher:
             fallback_path="/tickets/nightlife",
         )
 
-    def fetch_weekend_events(self) -> List[str]:
+    def _fetch_weekend_events(self) -> List[str]:
         params: MutableMapping[str, object] = {
             "limit": 50,
             "skip": 0,
@@ -124,6 +204,19 @@ class GoOutFetcher:
             fallback_path="/weekend",
         )
 
+    def fetch_all_events(self) -> Tuple[List[str], List[str]]:
+        """Fetch nightlife and weekend events concurrently.
+
+        Returns ``(nightlife_urls, weekend_urls)``. The two category calls
+        overlap on the network, so wall time is the slower of the two
+        instead of their sum.
+        """
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            nightlife = executor.submit(self.fetch_nightlife_events)
+            weekend = executor.submit(self.fetch_weekend_events)
+            return nightlife.result(), weekend.result()
+
     def _fetch_events(
         self,
         *,
@@ -144,7 +237,8 @@ class GoOutFetcher:
                 headers={"Accept": "application/json", "Content-Type": "application/json"},
                 proxies=DISABLE_PROXIES,
             )
-            response.raise_for_status()
+            if response.status_code >= 400:
+                response.raise_for_status()
             data = response.json()
         except requests.RequestException as exc:  # pragma: no cover - network error
             LOGGER.warning("Go Out API request failed, falling back to HTML: %%s", exc)
@@ -171,37 +265,36 @@ class GoOutFetcher:
                 headers={"User-Agent": "Mozilla/5.0"},
                 proxies=DISABLE_PROXIES,
             )
-            response.raise_for_status()
-            html = response.text
+            if response.status_code >= 400:
+                response.raise_for_status()
+            # Match against the raw bytes where possible; the slugs are plain
+            # ASCII, so decoding the whole page first is wasted work.
+            body = getattr(response, "content", None)
+            if body is None:
+                body = response.text.encode("utf-8")
         except requests.RequestException as exc:  # pragma: no cover - network error
             LOGGER.error("Failed to scrape Go Out HTML page: %%s", exc)
             return []
 
-        slugs = _extract_slugs_from_html(html)
-        urls = [append_affiliate_param(f"{GO_OUT_EVENT_BASE_URL}{slug}", self.referral) for slug in slugs]
+        slugs = _extract_slugs_from_bytes(body)
+        urls = [GO_OUT_EVENT_BASE_URL + slug + self._aff_suffix for slug in slugs]
         LOGGER.info("Collected %%d event URLs from HTML", len(urls))
         return urls
 
 
 def _extract_slugs_from_html(html: str) -> List[str]:
-    import re
+    return list(dict.fromkeys(_EVENT_SLUG_RE.findall(html)))
 
-    pattern = re.compile(r"/event/([a-zA-Z0-9-]+)")
-    slugs: List[str] = []
-    seen: set[str] = set()
-    for match in pattern.finditer(html):
-        slug = match.group(1)
-        if slug in seen:
-            continue
-        seen.add(slug)
-        slugs.append(slug)
-    return slugs
+
+def _extract_slugs_from_bytes(body: bytes) -> List[str]:
+    return [slug.decode("ascii") for slug in dict.fromkeys(_EVENT_SLUG_RE_BYTES.findall(body))]
 
 
 __all__ = [
     "GoOutFetcher",
     "append_affiliate_param",
     "_collect_go_out_event_urls",
+    "_iter_go_out_event_urls",
     "_extract_event_slug_from_ticket_item",
     "_extract_slugs_from_html",
 ]
@@ -0,0 +1,20 @@
+"""Process-wide HTTP session shared by all fetch jobs."""
+from __future__ import annotations
+
+import requests
+
+# One session for the whole process so the Go Out API calls, the HTML
+# fallback scrape, and the admin backend uploads reuse connections instead
+# of opening a new one per job. Transient 5xx responses and connection
+# failures are retried at the transport layer with exponential backoff;
+# the 401 token-rotation paths stay with the callers.
+SESSION = requests.Session(retries=3)
+# Every caller here talks JSON; setting the default once on the session
+# avoids re-merging it into the header dict on each call.
+SESSION.headers.update({"Accept": "application/json"})
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide shared session."""
+
+    return SESSION
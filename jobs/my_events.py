@@ -1,31 +1,72 @@
 """Fetch authenticated "my events" data from Go Out."""
 from __future__ import annotations
 
+import base64
 import json
 import logging
 import os
 import stat
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Mapping, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 
 import requests
 
+try:  # pragma: no cover - optional accelerator
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    _orjson = None
+
+from jobs import http
+from jobs._io import atomic_write_bytes
 from jobs.backend import PartiesAdminClient
 from jobs.event_records import EventRecord, build_event_records
-from jobs.go_out import _collect_go_out_event_urls
+from jobs.go_out import _iter_go_out_event_urls
 
 LOGGER = logging.getLogger(__name__)
 
 PAYLOAD_DIR = Path("auth_payload")
 TOKEN_FILE = PAYLOAD_DIR / "token.txt"
 COOKIES_FILE = PAYLOAD_DIR / "cookies.json"
-LOCAL_STORAGE_TOKEN_KEY = "authToken"
 GOOUT_TOKEN_ENV = "GOOUT_TOKEN"
 LOGIN_URL = "https://api.fe.prod.go-out.co/auth/login"
 EVENTS_URL = "https://api.fe.prod.go-out.co/events/myEvents"
 CAROUSEL_NAME = "my_events"
 
+# Static request parts, built once. Only the Authorization header and the
+# currentDate parameter vary per call; everything else is merged from these
+# read-only templates.
+_BASE_HEADERS = MappingProxyType(
+    {
+        "Accept": "application/json",
+        "Origin": "https://www.go-out.co",
+    }
+)
+_BASE_PARAMS = MappingProxyType(
+    {
+        "skip": 0,
+        "limit": 100,
+        "filter": '{"Title":"","activeEvents":true}',
+    }
+)
+
+# Process-wide session so the login, events fetch, and any retries reuse
+# the same connections as the other jobs.
+_SESSION = http.SESSION
+
+# In-memory copies of the auth payload files, so repeated fetches skip the
+# stat/read/parse round trip. Invalidated when the server rejects the token.
+_TOKEN_CACHE: Optional[str] = None
+_COOKIES_CACHE: Optional[Dict[str, str]] = None
+
+# Expiry of the cached token, decoded from its JWT ``exp`` claim (None when
+# the token is opaque). Lets fetch_events renew proactively instead of
+# burning a request on a guaranteed 401.
+_TOKEN_EXP: Optional[float] = None
+_TOKEN_RENEW_MARGIN = 60  # seconds before expiry at which renewal kicks in
+
 
 class AuthenticationError(RuntimeError):
     """Raised when credentials are missing or invalid."""
@@ -39,15 +80,8 @@ def _get_env_creds() -> tuple[str, str]:
     return email, password
 
 
-def _get_env_token() -> str:
-    token = os.environ.get(GOOUT_TOKEN_ENV)
-    if not token:
-        raise AuthenticationError(f"{GOOUT_TOKEN_ENV} must be set to bootstrap authentication")
-    return token
-
-
 def _write_token_file(token: str) -> None:
-    TOKEN_FILE.write_text(token, encoding="utf-8")
+    atomic_write_bytes(TOKEN_FILE, token.encode("utf-8"))
     try:
         TOKEN_FILE.chmod(stat.S_IRUSR | stat.S_IWUSR)
     except OSError:  # pragma: no cover - permissions vary by platform
@@ -55,109 +89,120 @@ def _write_token_file(token: str) -> None:
 
 
 def _write_cookies_file(cookies: Mapping[str, str]) -> None:
-    with COOKIES_FILE.open("w", encoding="utf-8") as file:
-        json.dump(dict(cookies), file, ensure_ascii=False, indent=2)
+    if _orjson is not None:
+        payload = _orjson.dumps(dict(cookies), option=_orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(dict(cookies), ensure_ascii=False, indent=2).encode("utf-8")
+    atomic_write_bytes(COOKIES_FILE, payload)
     try:
         COOKIES_FILE.chmod(stat.S_IRUSR | stat.S_IWUSR)
     except OSError:  # pragma: no cover - permissions vary by platform
         LOGGER.debug("Unable to set permissions on %s", COOKIES_FILE)
 
 
-def _create_webdriver() -> Any:
-    try:
-        from selenium import webdriver
-    except ImportError as exc:  # pragma: no cover - optional dependency
-        raise AuthenticationError("Selenium is required to bootstrap Go Out authentication") from exc
-
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    return webdriver.Chrome(options=options)
+# Identity and mtime of the token file last verified by
+# _ensure_auth_payload_initialized, so hot-looped runs skip the repeated
+# exists() syscalls. Keyed by path because tests repoint TOKEN_FILE.
+_AUTH_STATE: Dict[str, object] = {"path": None, "mtime": None}
 
 
-def _fetch_cookies_via_selenium(
-    token: str,
-    *,
-    webdriver_factory: Optional[Callable[[], Any]] = None,
-) -> Dict[str, str]:
-    factory = webdriver_factory or _create_webdriver
-    driver = factory()
+def _ensure_auth_payload_initialized() -> None:
     try:
-        driver.get("https://www.go-out.co/")
-        try:
-            driver.add_cookie({"name": "token", "value": token})
-        except Exception:  # pragma: no cover - browser specific behaviour
-            LOGGER.debug("Unable to persist token as cookie via Selenium")
-        try:
-            driver.execute_script(
-                "window.localStorage.setItem(arguments[0], arguments[1]);",
-                LOCAL_STORAGE_TOKEN_KEY,
-                token,
-            )
-        except Exception:  # pragma: no cover - browser specific behaviour
-            LOGGER.debug("Unable to persist token to localStorage via Selenium")
-        try:
-            driver.refresh()
-        except Exception:  # pragma: no cover - browser specific behaviour
-            LOGGER.debug("Unable to refresh Selenium page after authentication bootstrap")
-        raw_cookies = driver.get_cookies() or []
-    finally:
-        try:
-            driver.quit()
-        except Exception:  # pragma: no cover - browser specific behaviour
-            LOGGER.debug("Unable to gracefully quit Selenium webdriver")
-
-    cookies: Dict[str, str] = {}
-    for entry in raw_cookies:
-        if not isinstance(entry, Mapping):
-            continue
-        name = entry.get("name")
-        value = entry.get("value")
-        if not name or value is None:
-            continue
-        cookies[str(name)] = str(value)
-    return cookies
-
-
-def _ensure_auth_payload_initialized(*, webdriver_factory: Optional[Callable[[], Any]] = None) -> None:
+        mtime: Optional[float] = TOKEN_FILE.stat().st_mtime
+    except OSError:
+        mtime = None
+    if (
+        mtime is not None
+        and _AUTH_STATE["path"] == TOKEN_FILE
+        and _AUTH_STATE["mtime"] == mtime
+    ):
+        return
     if PAYLOAD_DIR.exists() and TOKEN_FILE.exists() and COOKIES_FILE.exists():
+        _AUTH_STATE["path"] = TOKEN_FILE
+        _AUTH_STATE["mtime"] = mtime
         return
 
     PAYLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    token = _get_env_token()
-    _write_token_file(token)
+    token = os.environ.get(GOOUT_TOKEN_ENV)
+    if token:
+        _write_token_file(token)
+    else:
+        renew_token_from_env()
+    # The events API authenticates via the bearer token alone, so an empty
+    # cookie jar is enough to keep the payload layout intact.
+    _write_cookies_file({})
+    try:
+        _AUTH_STATE["path"] = TOKEN_FILE
+        _AUTH_STATE["mtime"] = TOKEN_FILE.stat().st_mtime
+    except OSError:  # pragma: no cover - file just written
+        _AUTH_STATE["path"] = None
+        _AUTH_STATE["mtime"] = None
+
+
+def _invalidate_auth_cache() -> None:
+    global _TOKEN_CACHE, _COOKIES_CACHE, _TOKEN_EXP
+    _TOKEN_CACHE = None
+    _COOKIES_CACHE = None
+    _TOKEN_EXP = None
+    _AUTH_STATE["path"] = None
+    _AUTH_STATE["mtime"] = None
+
 
-    cookies = _fetch_cookies_via_selenium(token, webdriver_factory=webdriver_factory)
-    if not cookies:
-        LOGGER.warning("No cookies were retrieved via Selenium; authentication may fail")
-    _write_cookies_file(cookies)
+def _decode_token_exp(token: str) -> Optional[float]:
+    """Return the JWT ``exp`` claim of *token*, or None for opaque tokens.
+
+    The token is not verified — only the payload segment is decoded to read
+    its expiry.
+    """
+
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1]
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (ValueError, json.JSONDecodeError):
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    if isinstance(exp, (int, float)):
+        return float(exp)
+    return None
 
 
 def _read_token() -> str:
+    global _TOKEN_CACHE, _TOKEN_EXP
+    if _TOKEN_CACHE is not None:
+        return _TOKEN_CACHE
     _ensure_auth_payload_initialized()
     try:
-        return TOKEN_FILE.read_text(encoding="utf-8").strip()
+        _TOKEN_CACHE = TOKEN_FILE.read_text(encoding="utf-8").strip()
     except FileNotFoundError as exc:  # pragma: no cover - configuration issue
         raise AuthenticationError("Authentication token file is missing") from exc
+    _TOKEN_EXP = _decode_token_exp(_TOKEN_CACHE)
+    return _TOKEN_CACHE
 
 
 def _read_cookies() -> Dict[str, str]:
+    global _COOKIES_CACHE
+    if _COOKIES_CACHE is not None:
+        return _COOKIES_CACHE
     _ensure_auth_payload_initialized()
     try:
         with COOKIES_FILE.open(encoding="utf-8") as file:
             content = json.load(file)
         if not isinstance(content, dict):
             raise ValueError("Cookies file must contain a JSON object")
-        return {str(k): str(v) for k, v in content.items()}
+        _COOKIES_CACHE = {str(k): str(v) for k, v in content.items()}
     except FileNotFoundError as exc:  # pragma: no cover - configuration issue
         raise AuthenticationError("Cookies file is missing") from exc
+    return _COOKIES_CACHE
 
 
 def renew_token_from_env(session: Optional[requests.Session] = None) -> str:
+    global _TOKEN_CACHE, _TOKEN_EXP
     email, password = _get_env_creds()
     payload = {"username": email, "password": password}
-    session = session or requests.Session()
+    session = session or _SESSION
     response = session.post(LOGIN_URL, json=payload, timeout=20)
     if response.status_code != 200:
         raise AuthenticationError(
@@ -169,41 +214,44 @@ def renew_token_from_env(session: Optional[requests.Session] = None) -> str:
         raise AuthenticationError("No token provided in authentication response")
     PAYLOAD_DIR.mkdir(parents=True, exist_ok=True)
     _write_token_file(token)
+    # Seed the cache directly rather than re-reading the file just written.
+    _TOKEN_CACHE = token
+    _TOKEN_EXP = _decode_token_exp(token)
     LOGGER.info("Renewed Go Out API token")
     return token
 
 
 def fetch_events(session: Optional[requests.Session] = None) -> Dict[str, object]:
-    session = session or requests.Session()
-    headers = {
-        "Authorization": f"Bearer {_read_token()}",
-        "Accept": "application/json",
-        "Origin": "https://www.go-out.co",
-    }
+    session = session or _SESSION
+    token = _read_token()
+    if _TOKEN_EXP is not None and _TOKEN_EXP - time.time() < _TOKEN_RENEW_MARGIN:
+        LOGGER.info("Cached token expires soon, renewing proactively")
+        token = renew_token_from_env(session)
+    headers = {**_BASE_HEADERS, "Authorization": f"Bearer {token}"}
     params = {
-        "skip": 0,
-        "limit": 100,
-        "filter": '{"Title":"","activeEvents":true}',
+        **_BASE_PARAMS,
         "currentDate": datetime.now(tz=timezone.utc).isoformat(),
     }
     response = session.get(
         EVENTS_URL,
         headers=headers,
-        #cookies=_read_cookies(),
         params=params,
         timeout=20,
     )
     if response.status_code == 401:
         LOGGER.info("Token expired, attempting renewal")
+        _invalidate_auth_cache()
         headers["Authorization"] = f"Bearer {renew_token_from_env(session)}"
         response = session.get(
             EVENTS_URL,
             headers=headers,
-            cookies=_read_cookies(),
             params=params,
             timeout=20,
         )
-    response.raise_for_status()
+    # Cheap int compare on the hot path; only enter the raise machinery
+    # for error statuses.
+    if response.status_code >= 400:
+        response.raise_for_status()
     return response.json()
 
 
@@ -215,8 +263,9 @@ def _extract_event_records(data: Dict[str, object]) -> List[EventRecord]:
         raw_events = data.get("events")
         if isinstance(raw_events, list):
             events = raw_events
-    urls = _collect_go_out_event_urls(events, referral=None)
-    return build_event_records(CAROUSEL_NAME, urls)
+    # Feed the URL generator straight into the record builder so the batch
+    # is materialized exactly once.
+    return build_event_records(CAROUSEL_NAME, _iter_go_out_event_urls(events, referral=None))
 
 
 def run_job(
@@ -226,13 +275,13 @@ def run_job(
 ) -> List[EventRecord]:
     """Fetch "my events" data and upload event URLs to the backend."""
 
-    session = session or requests.Session()
+    session = session or _SESSION
     data = fetch_events(session=session)
     records = _extract_event_records(data)
 
     client = admin_client or PartiesAdminClient()
-    urls = [record["url"] for record in records]
-    client.add_party_urls(urls=urls)
+    urls = [record.url for record in records]
+    client.add_party_urls_bulk(urls=urls)
     LOGGER.info("Sent %d 'my events' URLs to backend", len(records))
     return records
 
@@ -5,8 +5,8 @@ import argparse
 import logging
 from typing import List, Optional
 
-from jobs import my_events, nightlife, weekend
-from jobs.event_records import EventRecord, merge_event_records
+import jobs
+from jobs.event_records import EventRecord
 
 
 def parse_args() -> argparse.Namespace:
@@ -25,12 +25,9 @@ def parse_args() -> argparse.Namespace:
 
 
 def run(referral: Optional[str] = None) -> List[EventRecord]:
-    """Run all fetch jobs and return merged event records."""
+    """Run all fetch jobs concurrently and return merged event records."""
 
-    collections = [
-        my_events.run_job(),
-    ]
-    return merge_event_records(collections)
+    return jobs.run_all(referral=referral)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,19 @@
 """Lightweight subset of the :mod:`requests` API used for offline testing."""
 from __future__ import annotations
 
+import http.client
 import json
+import ssl
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, Mapping, Optional
-from urllib import error as urllib_error
+from typing import Any, Dict, Mapping, Optional, Tuple
 from urllib import parse as urllib_parse
-from urllib import request as urllib_request
+
+try:  # pragma: no cover - optional accelerator
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    _orjson = None
 
 __all__ = [
     "RequestException",
@@ -16,6 +23,14 @@ __all__ = [
     "post",
 ]
 
+_MAX_REDIRECTS = 5
+
+# Transient statuses worth retrying at the transport layer; auth and client
+# errors stay with the caller.
+_DEFAULT_STATUS_FORCELIST = (500, 502, 503, 504)
+
+_SSL_CONTEXT = ssl.create_default_context()
+
 
 class RequestException(Exception):
     """Base exception for HTTP errors."""
@@ -34,6 +49,10 @@ class Response:
     _error: Optional[HTTPError] = None
 
     def json(self) -> Any:
+        if _orjson is not None:
+            # Decodes straight from the raw bytes, skipping the charset
+            # detection and str decode that ``text`` performs.
+            return _orjson.loads(self.content)
         return json.loads(self.text)
 
     @property
@@ -50,6 +69,74 @@ class Response:
 
 
 class Session:
+    """HTTP session with per-host keep-alive connections.
+
+    Connections are kept in a per-thread pool keyed by ``(scheme, host,
+    port)`` and reused across requests, so repeated calls to the same host
+    pay the TCP/TLS handshake once instead of per request.
+    ``http.client`` connections are not thread-safe, hence the
+    thread-local pool rather than a shared one.
+
+    ``retries`` enables transport-level retry with exponential backoff for
+    connection failures and transient 5xx statuses, mirroring
+    ``urllib3.util.Retry`` semantics. Retried requests reuse the pooled
+    connection where it is still healthy.
+    """
+
+    def __init__(
+        self,
+        *,
+        retries: int = 0,
+        backoff_factor: float = 0.3,
+        status_forcelist: Tuple[int, ...] = _DEFAULT_STATUS_FORCELIST,
+    ) -> None:
+        self._local = threading.local()
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._status_forcelist = frozenset(status_forcelist)
+        # Defaults sent with every request; per-call headers override
+        # matching keys, mirroring real requests.Session semantics.
+        self.headers: Dict[str, str] = {}
+
+    def _connections(self) -> Dict[Tuple[str, str, int], http.client.HTTPConnection]:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        return conns
+
+    def _get_connection(
+        self, scheme: str, host: str, port: int, timeout: Optional[float]
+    ) -> http.client.HTTPConnection:
+        conns = self._connections()
+        key = (scheme, host, port)
+        conn = conns.get(key)
+        if conn is None:
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(
+                    host, port, timeout=timeout, context=_SSL_CONTEXT
+                )
+            else:
+                conn = http.client.HTTPConnection(host, port, timeout=timeout)
+            conns[key] = conn
+        else:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        return conn
+
+    def _drop_connection(self, scheme: str, host: str, port: int) -> None:
+        conn = self._connections().pop((scheme, host, port), None)
+        if conn is not None:
+            conn.close()
+
+    def close(self) -> None:
+        """Close every pooled connection owned by the calling thread."""
+
+        conns = self._connections()
+        for conn in conns.values():
+            conn.close()
+        conns.clear()
+
     def request(
         self,
         method: str,
@@ -72,7 +159,7 @@ class Session:
             url = urllib_parse.urlunparse(parsed)
 
         data_bytes = None
-        request_headers: Dict[str, str] = {}
+        request_headers: Dict[str, str] = dict(self.headers)
         if headers:
             request_headers.update({str(k): str(v) for k, v in headers.items()})
 
@@ -80,33 +167,88 @@ class Session:
             data_bytes = json_dump(json)
             request_headers.setdefault("Content-Type", "application/json")
 
-        req = urllib_request.Request(url=url, data=data_bytes, method=method.upper())
-        for key, value in request_headers.items():
-            req.add_header(key, value)
-
-        try:
-            with urllib_request.urlopen(req, timeout=timeout) as response:
-                content = response.read()
-                headers_map = dict(response.headers.items()) if response.headers else {}
-                return Response(
-                    status_code=response.getcode() or 0,
-                    headers=headers_map,
-                    content=content,
-                    url=response.geturl(),
-                )
-        except urllib_error.HTTPError as exc:
-            content = exc.read() if hasattr(exc, "read") else b""
-            headers_map = dict(exc.headers.items()) if exc.headers else {}
-            error = HTTPError(str(exc))
+        method = method.upper()
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = self._send_with_retries(
+                method, url, data_bytes, request_headers, timeout
+            )
+            if response.status_code in (301, 302, 303, 307, 308):
+                location = response.headers.get("Location")
+                if location:
+                    url = urllib_parse.urljoin(url, location)
+                    if response.status_code == 303:
+                        method = "GET"
+                        data_bytes = None
+                    continue
+            return response
+        raise RequestException(f"Exceeded {_MAX_REDIRECTS} redirects for {url}")
+
+    def _send_with_retries(
+        self,
+        method: str,
+        url: str,
+        data_bytes: Optional[bytes],
+        request_headers: Mapping[str, str],
+        timeout: Optional[float],
+    ) -> Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._send(method, url, data_bytes, request_headers, timeout)
+            except RequestException:
+                if attempt >= self._retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in self._status_forcelist
+                    or attempt >= self._retries
+                ):
+                    return response
+            attempt += 1
+            time.sleep(self._backoff_factor * (2 ** (attempt - 1)))
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data_bytes: Optional[bytes],
+        request_headers: Mapping[str, str],
+        timeout: Optional[float],
+    ) -> Response:
+        parsed = urllib_parse.urlparse(url)
+        scheme = parsed.scheme or "http"
+        host = parsed.hostname or ""
+        port = parsed.port or (443 if scheme == "https" else 80)
+        path = parsed.path or "/"
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+
+        # Retry once on a stale keep-alive socket: the server may have
+        # closed an idle pooled connection between requests.
+        for attempt in (0, 1):
+            conn = self._get_connection(scheme, host, port, timeout)
+            try:
+                conn.request(method, path, body=data_bytes, headers=dict(request_headers))
+                raw = conn.getresponse()
+                content = raw.read()
+            except (http.client.HTTPException, ConnectionError, OSError) as exc:
+                self._drop_connection(scheme, host, port)
+                if attempt == 0:
+                    continue
+                raise RequestException(str(exc)) from exc
+            headers_map = dict(raw.getheaders())
+            status = raw.status or 0
+            error: Optional[HTTPError] = None
+            if status >= 400:
+                error = HTTPError(f"HTTP Error {status}: {raw.reason}")
             return Response(
-                status_code=getattr(exc, "code", 0) or 0,
+                status_code=status,
                 headers=headers_map,
                 content=content,
                 url=url,
                 _error=error,
             )
-        except urllib_error.URLError as exc:  # pragma: no cover - network error handling
-            raise RequestException(str(exc)) from exc
+        raise RequestException(f"Unable to reach {url}")  # pragma: no cover
 
     def get(self, url: str, **kwargs: Any) -> Response:
         return self.request("GET", url, **kwargs)
@@ -124,4 +266,6 @@ def post(url: str, **kwargs: Any) -> Response:  # pragma: no cover - simple pass
 
 
 def json_dump(payload: Any) -> bytes:
+    if _orjson is not None:
+        return _orjson.dumps(payload)
     return json.dumps(payload, ensure_ascii=False).encode("utf-8")
@@ -23,8 +23,22 @@ class DummyResponse:
 
 
 class DummySession:
-    def __init__(self, responses: List[DummyResponse]) -> None:
-        self._responses = responses
+    """Session double that maps each posted URL payload to a canned response.
+
+    ``add_party_urls`` posts concurrently, so responses are keyed by payload
+    rather than queued in call order.
+    """
+
+    def __init__(
+        self,
+        *,
+        login_response: DummyResponse,
+        party_responses: Dict[str, DummyResponse],
+        bulk_response: DummyResponse = None,
+    ) -> None:
+        self._login_response = login_response
+        self._party_responses = party_responses
+        self._bulk_response = bulk_response
         self.calls: List[Dict[str, Any]] = []
 
     def post(self, url: str, *, json=None, headers=None, timeout=None):
@@ -34,18 +48,34 @@ class DummySession:
             "headers": headers,
             "timeout": timeout,
         })
-        if not self._responses:
-            raise AssertionError("No more queued responses")
-        return self._responses.pop(0)
+        if url.endswith(backend.LOGIN_ENDPOINT):
+            return self._login_response
+        if url.endswith(backend.ADD_PARTIES_BULK_ENDPOINT):
+            if self._bulk_response is None:
+                raise AssertionError("Unexpected bulk add request")
+            return self._bulk_response
+        party_url = json["url"]
+        if party_url not in self._party_responses:
+            raise AssertionError(f"Unexpected party URL {party_url}")
+        response = self._party_responses[party_url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(autouse=True)
+def _isolated_token_cache(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    monkeypatch.setattr(backend, "TOKEN_CACHE_FILE", tmp_path / "backend_token.json")
 
 
 def test_add_party_urls_posts_each_url(monkeypatch: pytest.MonkeyPatch) -> None:
-    responses = [
-        DummyResponse(200, {"token": "abc"}),
-        DummyResponse(200, {"status": "ok", "url": "https://first"}),
-        DummyResponse(200, {"status": "ok", "url": "https://second"}),
-    ]
-    session = DummySession(responses)
+    session = DummySession(
+        login_response=DummyResponse(200, {"token": "abc"}),
+        party_responses={
+            "https://first": DummyResponse(200, {"status": "ok", "url": "https://first"}),
+            "https://second": DummyResponse(200, {"status": "ok", "url": "https://second"}),
+        },
+    )
     monkeypatch.setattr(backend, "get_admin_password", lambda env_path=None: "secret")
 
     client = backend.PartiesAdminClient(session=session)
@@ -66,18 +96,22 @@ def test_add_party_urls_posts_each_url(monkeypatch: pytest.MonkeyPatch) -> None:
         },
     ]
     assert session.calls[0]["url"].endswith(backend.LOGIN_ENDPOINT)
-    assert session.calls[1]["json"] == {"url": "https://first"}
-    assert session.calls[2]["json"] == {"url": "https://second"}
-    assert session.calls[1]["headers"]["Authorization"] == "Bearer abc"
+    party_calls = session.calls[1:]
+    assert sorted(call["json"]["url"] for call in party_calls) == [
+        "https://first",
+        "https://second",
+    ]
+    assert all(call["headers"]["Authorization"] == "Bearer abc" for call in party_calls)
 
 
 def test_add_party_urls_logs_statuses(monkeypatch: pytest.MonkeyPatch, caplog):
-    responses = [
-        DummyResponse(200, {"token": "abc"}),
-        DummyResponse(409, {"detail": "Already exists"}),
-        DummyResponse(200, {"status": "ok"}),
-    ]
-    session = DummySession(responses)
+    session = DummySession(
+        login_response=DummyResponse(200, {"token": "abc"}),
+        party_responses={
+            "https://first": DummyResponse(409, {"detail": "Already exists"}),
+            "https://second": DummyResponse(200, {"status": "ok"}),
+        },
+    )
     monkeypatch.setattr(backend, "get_admin_password", lambda env_path=None: "secret")
     caplog.set_level(logging.INFO, backend.LOGGER.name)
 
@@ -89,10 +123,124 @@ def test_add_party_urls_logs_statuses(monkeypatch: pytest.MonkeyPatch, caplog):
     assert result[1]["status_code"] == 200
     assert result[1]["detail"] == "Party added successfully"
 
+    status_logs = [
+        record.getMessage()
+        for record in caplog.records
+        if "Party add status:" in record.getMessage()
+    ]
+    assert "Party add status: https://first -> 409 Already exists" in status_logs
+    assert "Party add status: https://second -> 200 Party added successfully" in status_logs
+
     summary_logs = [
-        record for record in caplog.records if "Party add statuses" in record.getMessage()
+        record for record in caplog.records if "Sent 2 party URLs" in record.getMessage()
     ]
     assert summary_logs
-    summary_message = summary_logs[-1].getMessage()
-    assert "https://first: 409 - Already exists" in summary_message
-    assert "https://second: 200 - Party added successfully" in summary_message
+    assert "1 added, 1 conflict, 0 error" in summary_logs[-1].getMessage()
+
+
+def test_add_party_urls_captures_request_errors(
+    monkeypatch: pytest.MonkeyPatch, caplog
+) -> None:
+    session = DummySession(
+        login_response=DummyResponse(200, {"token": "abc"}),
+        party_responses={
+            "https://first": backend.requests.RequestException("connection reset"),
+            "https://second": DummyResponse(200, {"status": "ok"}),
+        },
+    )
+    monkeypatch.setattr(backend, "get_admin_password", lambda env_path=None: "secret")
+    caplog.set_level(logging.INFO, backend.LOGGER.name)
+
+    client = backend.PartiesAdminClient(session=session)
+    result = client.add_party_urls(["https://first", "https://second"])
+
+    assert result[0] == {"detail": "connection reset", "status_code": None}
+    assert result[1]["status_code"] == 200
+
+    summary_logs = [
+        record for record in caplog.records if "Sent 2 party URLs" in record.getMessage()
+    ]
+    assert "1 added, 0 conflict, 1 error" in summary_logs[-1].getMessage()
+
+
+def test_add_party_urls_bulk_posts_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    bulk_results = [
+        {"url": "https://first", "status_code": 200, "detail": "Party added successfully"},
+        {"url": "https://second", "status_code": 409, "detail": "Party already added"},
+    ]
+    session = DummySession(
+        login_response=DummyResponse(200, {"token": "abc"}),
+        party_responses={},
+        bulk_response=DummyResponse(200, {"results": bulk_results}),
+    )
+    monkeypatch.setattr(backend, "get_admin_password", lambda env_path=None: "secret")
+
+    client = backend.PartiesAdminClient(session=session)
+    result = client.add_party_urls_bulk(["https://first", "https://second"])
+
+    assert result == bulk_results
+    bulk_calls = [
+        call for call in session.calls
+        if call["url"].endswith(backend.ADD_PARTIES_BULK_ENDPOINT)
+    ]
+    assert len(bulk_calls) == 1
+    assert bulk_calls[0]["json"] == {"urls": ["https://first", "https://second"]}
+
+
+def test_add_party_urls_bulk_falls_back_to_per_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = DummySession(
+        login_response=DummyResponse(200, {"token": "abc"}),
+        party_responses={
+            "https://first": DummyResponse(200, {"status": "ok"}),
+        },
+        bulk_response=DummyResponse(404, {}),
+    )
+    monkeypatch.setattr(backend, "get_admin_password", lambda env_path=None: "secret")
+
+    client = backend.PartiesAdminClient(session=session)
+    result = client.add_party_urls_bulk(["https://first"])
+
+    assert result[0]["status_code"] == 200
+    party_calls = [
+        call for call in session.calls
+        if call["url"].endswith(backend.ADD_PARTY_ENDPOINT)
+    ]
+    assert [call["json"] for call in party_calls] == [{"url": "https://first"}]
+
+
+def test_cached_token_skips_login(monkeypatch: pytest.MonkeyPatch) -> None:
+    backend._store_cached_token("cached-token")
+    session = DummySession(
+        login_response=DummyResponse(500, {}),
+        party_responses={
+            "https://first": DummyResponse(200, {"status": "ok"}),
+        },
+    )
+    monkeypatch.setattr(backend, "get_admin_password", lambda env_path=None: "secret")
+
+    client = backend.PartiesAdminClient(session=session)
+    client.add_party_urls(["https://first"])
+
+    login_calls = [
+        call for call in session.calls if call["url"].endswith(backend.LOGIN_ENDPOINT)
+    ]
+    assert login_calls == []
+    assert session.calls[0]["headers"]["Authorization"] == "Bearer cached-token"
+
+
+def test_expired_cached_token_triggers_login(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(backend, "TOKEN_CACHE_TTL", -60)
+    backend._store_cached_token("stale-token")
+    session = DummySession(
+        login_response=DummyResponse(200, {"token": "fresh"}),
+        party_responses={
+            "https://first": DummyResponse(200, {"status": "ok"}),
+        },
+    )
+    monkeypatch.setattr(backend, "get_admin_password", lambda env_path=None: "secret")
+
+    client = backend.PartiesAdminClient(session=session)
+    client.add_party_urls(["https://first"])
+
+    assert session.calls[0]["url"].endswith(backend.LOGIN_ENDPOINT)
+    assert session.calls[1]["headers"]["Authorization"] == "Bearer fresh"
@@ -6,11 +6,18 @@ from jobs.event_records import EventRecord, build_event_records, merge_event_rec
 def test_build_event_records_adds_title() -> None:
     records = build_event_records("nightlife", ["https://example.com/a", "b"])
     assert records == [
-        {"title": "nightlife", "url": "https://example.com/a"},
-        {"title": "nightlife", "url": "b"},
+        EventRecord("nightlife", "https://example.com/a"),
+        EventRecord("nightlife", "b"),
     ]
 
 
+def test_event_record_fields() -> None:
+    record = EventRecord("nightlife", "https://example.com/a")
+    assert record.title == "nightlife"
+    assert record.url == "https://example.com/a"
+    assert record._asdict() == {"title": "nightlife", "url": "https://example.com/a"}
+
+
 def test_merge_event_records_flattens_lists() -> None:
     collections: list[list[EventRecord]] = [
         build_event_records("nightlife", ["a"]),
@@ -18,7 +25,7 @@ def test_merge_event_records_flattens_lists() -> None:
     ]
     merged = merge_event_records(collections)
     assert merged == [
-        {"title": "nightlife", "url": "a"},
-        {"title": "weekend", "url": "b"},
-        {"title": "weekend", "url": "c"},
+        EventRecord("nightlife", "a"),
+        EventRecord("weekend", "b"),
+        EventRecord("weekend", "c"),
     ]
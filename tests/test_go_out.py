@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
+import pytest
+
+from jobs import _cache
 from jobs.go_out import (
     GO_OUT_EVENT_BASE_URL,
     GoOutFetcher,
@@ -101,3 +104,42 @@ def test_fetcher_uses_html_fallback_on_json_error() -> None:
     assert urls == [f"{GO_OUT_EVENT_BASE_URL}from-html"]
     assert len(session.request_calls) == 1
     assert len(session.get_calls) == 1
+
+
+def test_fetch_all_events_returns_both_categories() -> None:
+    response = MockResponse(json_data={"events": [{"Url": "foo"}]})
+    html_response = MockResponse(text="")
+    session = MockSession(response=response, html_response=html_response)
+    fetcher = GoOutFetcher(referral=None, session=session)
+
+    nightlife_urls, weekend_urls = fetcher.fetch_all_events()
+
+    assert nightlife_urls == [f"{GO_OUT_EVENT_BASE_URL}foo"]
+    assert weekend_urls == [f"{GO_OUT_EVENT_BASE_URL}foo"]
+    assert len(session.request_calls) == 2
+
+
+def test_fetcher_serves_cached_urls(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    monkeypatch.setattr(_cache, "CACHE_DIR", tmp_path / "cache")
+    response = MockResponse(json_data={"events": [{"Url": "foo"}]})
+    html_response = MockResponse(text="")
+    session = MockSession(response=response, html_response=html_response)
+    fetcher = GoOutFetcher(referral=None, session=session, use_cache=True)
+
+    first = fetcher.fetch_nightlife_events()
+    second = fetcher.fetch_nightlife_events()
+
+    assert first == second == [f"{GO_OUT_EVENT_BASE_URL}foo"]
+    assert len(session.request_calls) == 1
+
+
+def test_fetcher_cache_disabled_by_default() -> None:
+    response = MockResponse(json_data={"events": [{"Url": "foo"}]})
+    html_response = MockResponse(text="")
+    session = MockSession(response=response, html_response=html_response)
+    fetcher = GoOutFetcher(referral=None, session=session)
+
+    fetcher.fetch_nightlife_events()
+    fetcher.fetch_nightlife_events()
+
+    assert len(session.request_calls) == 2
@@ -5,6 +5,7 @@ from typing import List
 import pytest
 
 from jobs import my_events, nightlife, weekend
+from jobs.event_records import EventRecord
 from jobs.go_out import GO_OUT_EVENT_BASE_URL
 
 
@@ -36,6 +37,16 @@ class DummyAdminClient:
         self.add_party_calls.append(list(urls))
         return [{"message": "ok"} for _ in urls]
 
+    def add_party_urls_bulk(self, *, urls: List[str]):
+        self.add_party_calls.append(list(urls))
+        return [{"message": "ok"} for _ in urls]
+
+
+def test_job_modules_expose_canonical_api() -> None:
+    for module in (nightlife, weekend, my_events):
+        assert hasattr(module, "CAROUSEL_NAME")
+        assert hasattr(module, "run_job")
+
 
 def test_nightlife_run_job_returns_records(monkeypatch: pytest.MonkeyPatch) -> None:
     urls = ["https://example.com/event/a"]
@@ -49,7 +60,7 @@ def test_nightlife_run_job_returns_records(monkeypatch: pytest.MonkeyPatch) -> N
 
     records = nightlife.run_job(referral="ref", admin_client=client)
 
-    assert records == [{"title": "nightlife", "url": urls[0]}]
+    assert records == [EventRecord("nightlife", urls[0])]
     assert client.carousel_calls == [
         {
             "carousel_name": "nightlife",
@@ -72,7 +83,7 @@ def test_weekend_run_job_returns_records(monkeypatch: pytest.MonkeyPatch) -> Non
 
     records = weekend.run_job(referral="ref", admin_client=client)
 
-    assert records == [{"title": "weekend", "url": urls[0]}]
+    assert records == [EventRecord("weekend", urls[0])]
     assert client.carousel_calls == [
         {
             "carousel_name": "weekend",
@@ -102,8 +113,8 @@ def test_my_events_run_job_extracts_urls(monkeypatch: pytest.MonkeyPatch) -> Non
     records = my_events.run_job(admin_client=client)
 
     assert records == [
-        {"title": "my_events", "url": f"{GO_OUT_EVENT_BASE_URL}first"},
-        {"title": "my_events", "url": f"{GO_OUT_EVENT_BASE_URL}second"},
+        EventRecord("my_events", f"{GO_OUT_EVENT_BASE_URL}first"),
+        EventRecord("my_events", f"{GO_OUT_EVENT_BASE_URL}second"),
     ]
     assert client.carousel_calls == []
-    assert client.add_party_calls == [[record["url"] for record in records]]
+    assert client.add_party_calls == [[record.url for record in records]]
@@ -1,124 +1,127 @@
 from __future__ import annotations
 
+import base64
 import json
+import time
 from pathlib import Path
-from typing import Any, Dict, List
 
 import pytest
 
 from jobs import my_events
 
 
-class FakeDriver:
-    def __init__(self, cookies: List[Dict[str, Any]]) -> None:
-        self.cookies = cookies
-        self.calls: List[tuple[str, Any]] = []
+@pytest.fixture(autouse=True)
+def _isolated_auth_payload(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    payload_dir = tmp_path / "payload"
+    monkeypatch.setattr(my_events, "PAYLOAD_DIR", payload_dir)
+    monkeypatch.setattr(my_events, "TOKEN_FILE", payload_dir / "token.txt")
+    monkeypatch.setattr(my_events, "COOKIES_FILE", payload_dir / "cookies.json")
+    my_events._invalidate_auth_cache()
 
-    def get(self, url: str) -> None:
-        self.calls.append(("get", url))
 
-    def add_cookie(self, cookie: Dict[str, Any]) -> None:
-        self.calls.append(("add_cookie", cookie))
+def test_ensure_auth_payload_uses_env_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(my_events.GOOUT_TOKEN_ENV, "from-env")
 
-    def execute_script(self, script: str, *args: Any) -> None:
-        self.calls.append(("execute_script", script, *args))
+    def fail_renew(session=None):
+        raise AssertionError("Should not log in when a token is provided")
 
-    def refresh(self) -> None:
-        self.calls.append(("refresh", None))
+    monkeypatch.setattr(my_events, "renew_token_from_env", fail_renew)
 
-    def get_cookies(self) -> List[Dict[str, Any]]:
-        self.calls.append(("get_cookies", None))
-        return self.cookies
+    my_events._ensure_auth_payload_initialized()
 
-    def quit(self) -> None:
-        self.calls.append(("quit", None))
+    assert my_events.TOKEN_FILE.read_text(encoding="utf-8") == "from-env"
+    assert json.loads(my_events.COOKIES_FILE.read_text(encoding="utf-8")) == {}
 
 
-def test_fetch_cookies_via_selenium_uses_webdriver_factory() -> None:
-    cookies = [
-        {"name": "session", "value": "cookie"},
-        {"name": "token", "value": "abc"},
-        {"name": None, "value": "ignored"},
-        {"name": "missing", "value": None},
-    ]
-    driver = FakeDriver(cookies=cookies)
+def test_ensure_auth_payload_renews_without_env_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv(my_events.GOOUT_TOKEN_ENV, raising=False)
 
-    result = my_events._fetch_cookies_via_selenium(
-        "env-token",
-        webdriver_factory=lambda: driver,
-    )
+    def fake_renew(session=None):
+        my_events.TOKEN_FILE.write_text("renewed", encoding="utf-8")
+        return "renewed"
 
-    assert result == {"session": "cookie", "token": "abc"}
-    assert driver.calls == [
-        ("get", "https://www.go-out.co/"),
-        ("add_cookie", {"name": "token", "value": "env-token"}),
-        (
-            "execute_script",
-            "window.localStorage.setItem(arguments[0], arguments[1]);",
-            my_events.LOCAL_STORAGE_TOKEN_KEY,
-            "env-token",
-        ),
-        ("refresh", None),
-        ("get_cookies", None),
-        ("quit", None),
-    ]
+    monkeypatch.setattr(my_events, "renew_token_from_env", fake_renew)
 
+    my_events._ensure_auth_payload_initialized()
 
-def test_ensure_auth_payload_initializes_missing_files(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
-) -> None:
-    payload_dir = tmp_path / "payload"
-    token_file = payload_dir / "token.txt"
-    cookies_file = payload_dir / "cookies.json"
+    assert my_events.TOKEN_FILE.read_text(encoding="utf-8") == "renewed"
+    assert json.loads(my_events.COOKIES_FILE.read_text(encoding="utf-8")) == {}
 
-    monkeypatch.setattr(my_events, "PAYLOAD_DIR", payload_dir)
-    monkeypatch.setattr(my_events, "TOKEN_FILE", token_file)
-    monkeypatch.setattr(my_events, "COOKIES_FILE", cookies_file)
 
-    captured: Dict[str, Any] = {}
+def test_ensure_auth_payload_noop_when_files_exist(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    my_events.PAYLOAD_DIR.mkdir(parents=True)
+    my_events.TOKEN_FILE.write_text("existing-token", encoding="utf-8")
+    my_events.COOKIES_FILE.write_text("{}", encoding="utf-8")
 
-    def fake_fetch(token: str, *, webdriver_factory=None):
-        captured["token"] = token
-        captured["factory_passed"] = webdriver_factory
-        return {"session": "cookie"}
+    def fail_renew(session=None):
+        raise AssertionError("Should not renew when files already exist")
 
-    monkeypatch.setattr(my_events, "_fetch_cookies_via_selenium", fake_fetch)
-    monkeypatch.setenv(my_events.GOOUT_TOKEN_ENV, "from-env")
+    monkeypatch.setattr(my_events, "renew_token_from_env", fail_renew)
+    monkeypatch.setenv(my_events.GOOUT_TOKEN_ENV, "should-not-use")
 
     my_events._ensure_auth_payload_initialized()
 
-    assert payload_dir.exists()
-    assert token_file.read_text(encoding="utf-8") == "from-env"
-    assert json.loads(cookies_file.read_text(encoding="utf-8")) == {"session": "cookie"}
-    assert captured == {"token": "from-env", "factory_passed": None}
+    assert my_events.TOKEN_FILE.read_text(encoding="utf-8") == "existing-token"
+    assert my_events.COOKIES_FILE.read_text(encoding="utf-8") == "{}"
 
 
-def test_ensure_auth_payload_noop_when_files_exist(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+def test_ensure_auth_payload_memoizes_by_token_mtime(
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    payload_dir = tmp_path / "payload"
-    payload_dir.mkdir()
-    token_file = payload_dir / "token.txt"
-    cookies_file = payload_dir / "cookies.json"
-    token_file.write_text("existing-token", encoding="utf-8")
-    cookies_file.write_text("{}", encoding="utf-8")
+    my_events.PAYLOAD_DIR.mkdir(parents=True)
+    my_events.TOKEN_FILE.write_text("tok", encoding="utf-8")
+    my_events.COOKIES_FILE.write_text("{}", encoding="utf-8")
+    my_events._ensure_auth_payload_initialized()
 
-    monkeypatch.setattr(my_events, "PAYLOAD_DIR", payload_dir)
-    monkeypatch.setattr(my_events, "TOKEN_FILE", token_file)
-    monkeypatch.setattr(my_events, "COOKIES_FILE", cookies_file)
+    # With the token file untouched, the memoized check skips the payload
+    # inspection entirely.
+    my_events.COOKIES_FILE.unlink()
+    my_events._ensure_auth_payload_initialized()
+    assert not my_events.COOKIES_FILE.exists()
+
+    my_events._invalidate_auth_cache()
+    monkeypatch.setenv(my_events.GOOUT_TOKEN_ENV, "tok")
+    my_events._ensure_auth_payload_initialized()
+    assert my_events.COOKIES_FILE.exists()
 
-    called = False
 
-    def fake_fetch(token: str, *, webdriver_factory=None):
-        nonlocal called
-        called = True
-        return {}
+def test_read_token_caches_file_contents() -> None:
+    my_events.PAYLOAD_DIR.mkdir(parents=True)
+    my_events.TOKEN_FILE.write_text("cached-token\n", encoding="utf-8")
+    my_events.COOKIES_FILE.write_text("{}", encoding="utf-8")
 
-    monkeypatch.setattr(my_events, "_fetch_cookies_via_selenium", fake_fetch)
-    monkeypatch.setenv(my_events.GOOUT_TOKEN_ENV, "should-not-use")
+    assert my_events._read_token() == "cached-token"
 
-    my_events._ensure_auth_payload_initialized()
+    my_events.TOKEN_FILE.write_text("changed-on-disk", encoding="utf-8")
+    assert my_events._read_token() == "cached-token"
+
+    my_events._invalidate_auth_cache()
+    assert my_events._read_token() == "changed-on-disk"
+
+
+def _make_jwt(exp: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=")
+    return f"header.{payload.decode()}.signature"
+
+
+def test_decode_token_exp_reads_jwt_claim() -> None:
+    assert my_events._decode_token_exp(_make_jwt(1234.0)) == 1234.0
+    assert my_events._decode_token_exp("opaque-token") is None
+    assert my_events._decode_token_exp("a.not-base64!.c") is None
+
+
+def test_read_token_tracks_jwt_expiry() -> None:
+    expires_at = time.time() + 3600
+    my_events.PAYLOAD_DIR.mkdir(parents=True)
+    my_events.TOKEN_FILE.write_text(_make_jwt(expires_at), encoding="utf-8")
+    my_events.COOKIES_FILE.write_text("{}", encoding="utf-8")
+
+    my_events._read_token()
+    assert my_events._TOKEN_EXP == pytest.approx(expires_at)
 
-    assert not called
-    assert token_file.read_text(encoding="utf-8") == "existing-token"
-    assert cookies_file.read_text(encoding="utf-8") == "{}"
+    my_events._invalidate_auth_cache()
+    assert my_events._TOKEN_EXP is None